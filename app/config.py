@@ -48,3 +48,9 @@ OUTPUT_DIMENSIONS = {
 OPTIMIZE_MAX_SIZE = 768  # Longest edge in pixels
 OPTIMIZE_QUALITY = 85    # JPEG quality (1-100)
 
+# Optimized images up to this size are sent to fal.ai inline as base64
+# data URIs instead of being uploaded to the fal CDN first
+INLINE_IMAGE_MAX_KB = 256
+# Cap on the combined size of inline images in one request
+INLINE_TOTAL_MAX_KB = 2048
+
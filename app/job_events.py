@@ -0,0 +1,96 @@
+"""Per-process fan-out of worker job events to open SSE streams.
+
+The worker publishes every job status write to ``job_events:{job_id}``.
+Rather than each SSE stream holding its own pub/sub connection to the
+shared Redis, a process keeps a single ``psubscribe("job_events:*")``
+connection and hands each message to the queues of the streams watching
+that job. Open streams therefore cost one Redis connection per process,
+however many clients are connected.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+CHANNEL_PREFIX = "job_events:"
+
+# Seconds to wait between reconnect attempts after the subscription drops
+RECONNECT_DELAY_SECONDS = 1
+
+# Sentinel put on every queue after a reconnect: messages may have been
+# missed, so the stream should re-read the job's current state
+RESYNC = None
+
+
+class SubscriberUnavailable(Exception):
+    """The shared subscription could not be (re)established in time."""
+
+
+class JobEventHub:
+    """One pattern subscription, fanned out to per-stream asyncio Queues."""
+
+    def __init__(self, redis_client):
+        self._redis = redis_client
+        self._streams: dict[str, set[asyncio.Queue]] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._ready = asyncio.Event()
+
+    async def subscribe(self, job_id: str, timeout: float) -> asyncio.Queue:
+        """Register a stream for ``job_id`` and return its message queue.
+
+        Returns once the shared subscription is live, so the caller can
+        read the job's current state without missing a later update.
+        Raises SubscriberUnavailable if that takes longer than ``timeout``.
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        self._streams.setdefault(job_id, set()).add(queue)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._listen())
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            self.unsubscribe(job_id, queue)
+            raise SubscriberUnavailable("Job event subscription unavailable")
+        except BaseException:
+            self.unsubscribe(job_id, queue)
+            raise
+        return queue
+
+    def unsubscribe(self, job_id: str, queue: asyncio.Queue) -> None:
+        queues = self._streams.get(job_id)
+        if queues is None:
+            return
+        queues.discard(queue)
+        if not queues:
+            del self._streams[job_id]
+
+    async def _listen(self) -> None:
+        reconnect = False
+        while True:
+            pubsub = self._redis.pubsub()
+            try:
+                await pubsub.psubscribe(f"{CHANNEL_PREFIX}*")
+                self._ready.set()
+                if reconnect:
+                    for queues in self._streams.values():
+                        for queue in queues:
+                            queue.put_nowait(RESYNC)
+
+                async for message in pubsub.listen():
+                    if message["type"] != "pmessage":
+                        continue
+                    job_id = message["channel"][len(CHANNEL_PREFIX):].decode()
+                    for queue in self._streams.get(job_id, ()):
+                        queue.put_nowait(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Job event subscription dropped, reconnecting: {e}")
+            finally:
+                self._ready.clear()
+                await pubsub.reset()
+            reconnect = True
+            await asyncio.sleep(RECONNECT_DELAY_SECONDS)
@@ -1,25 +1,28 @@
 """Bowerbirder API - Photo collage generator using fal.ai"""
 from app.settings import settings
+import asyncio
 import uuid
-import json
+import base64
+import binascii
 import os
-import shutil
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Annotated, Optional
 
-from fastapi import FastAPI, HTTPException, Request
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, HTTPException, Request, UploadFile
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from starlette.middleware.base import BaseHTTPMiddleware
-from pydantic import BaseModel, Field
-import redis
+import orjson
+import msgspec
 
 from app.config import (
     STYLE_PRESETS, ASPECT_RATIOS, MIN_IMAGES, MAX_IMAGES,
     MAX_IMAGE_SIZE_MB, MAX_TOTAL_SIZE_MB, OUTPUT_EXPIRY_MINUTES, MAX_QUEUE_LENGTH
 )
 from app.ratelimit import check_rate_limit, get_trusted_client_ip
+from app.redis_pool import create_redis_client, create_async_redis_client
+from app.job_events import RESYNC, JobEventHub, SubscriberUnavailable
 
 app = FastAPI(title="Bowerbirder API")
 
@@ -42,14 +45,31 @@ app.add_middleware(
 )
 
 # Redis connection
-redis_client = redis.from_url(settings.redis_url)
+redis_client = create_redis_client(settings.redis_url)
+# Async client for SSE streams: one shared job_events subscription per
+# process, plus the job reads each stream makes
+async_redis_client = create_async_redis_client(settings.redis_url)
+job_events = JobEventHub(async_redis_client)
 
 # Config
 ENVIRONMENT = settings.environment
 OUTPUT_DIR = settings.output_dir
 IMAGE_EXPIRY_MINUTES = settings.image_expiry_minutes
 API_ALLOWED_IPS = settings.allowed_ips_list
-JOB_IMAGES_DIR = settings.job_images_dir
+
+# Precomputed lookups for request validation
+ALLOWED_STYLES = frozenset(STYLE_PRESETS)
+STYLE_KEYS = list(STYLE_PRESETS)
+ALLOWED_ASPECT_RATIOS = frozenset(ASPECT_RATIOS)
+
+# Seconds between SSE keepalive comments while a job stream is idle
+SSE_KEEPALIVE_SECONDS = 15
+# Longest a single stream stays open (matches the frontend's polling
+# timeout), so a job orphaned by a dead worker can't hold one forever
+SSE_MAX_STREAM_SECONDS = 360
+# Longest a new stream waits for the shared subscription before a 503
+SSE_SUBSCRIBE_TIMEOUT_SECONDS = 5
+TERMINAL_STATUSES = ("completed", "failed")
 
 # Rate limiting (anonymous expensive /jobs endpoint)
 RATE_LIMIT_ENABLED = settings.rate_limit_enabled
@@ -89,18 +109,43 @@ class IPWhitelistMiddleware(BaseHTTPMiddleware):
 app.add_middleware(IPWhitelistMiddleware)
 
 
-class JobRequest(BaseModel):
-    images: list[str] = Field(..., min_length=MIN_IMAGES, max_length=MAX_IMAGES)
+def decode_base64_image(data_url: str) -> bytes:
+    """Decode base64 data URL to bytes"""
+    # Handle data URL format: data:image/jpeg;base64,/9j/4AAQ...
+    if data_url.startswith('data:'):
+        # Split off the header
+        header, base64_data = data_url.split(',', 1)
+    else:
+        base64_data = data_url
+
+    return base64.b64decode(base64_data)
+
+
+class JobRequest(msgspec.Struct):
+    """JSON body for POST /jobs.
+
+    Decoded with msgspec straight from the request bytes: the image strings
+    can total MAX_TOTAL_SIZE_MB, which Pydantic would walk in Python.
+    """
+    images: Annotated[list[str], msgspec.Meta(min_length=MIN_IMAGES, max_length=MAX_IMAGES)]
     style: str = "fridge"
     aspect_ratio: str = "16:9"
 
 
-class JobResponse(BaseModel):
+class MsgspecResponse(Response):
+    """JSON response encoded with msgspec (responses skip Pydantic entirely)"""
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        return msgspec.json.encode(content)
+
+
+class JobResponse(msgspec.Struct):
     job_id: str
     status: str
 
 
-class JobStatus(BaseModel):
+class JobStatus(msgspec.Struct):
     job_id: str
     status: str
     status_detail: Optional[str] = None
@@ -109,34 +154,115 @@ class JobStatus(BaseModel):
     error: Optional[str] = None
 
 
+class Option(msgspec.Struct):
+    id: str
+    name: str
+
+
+class AspectRatios(msgspec.Struct):
+    aspect_ratios: list[str]
+
+
 @app.get("/health")
 def health():
     return {"status": "ok"}
 
 
-@app.get("/options")
+@app.get("/options", response_class=MsgspecResponse)
 def list_options():
     """List available style presets"""
-    return [
-        {"id": key, "name": preset["name"]}
+    return MsgspecResponse([
+        Option(id=key, name=preset["name"])
         for key, preset in STYLE_PRESETS.items()
-    ]
+    ])
 
 
-@app.get("/aspect-ratios")
+@app.get("/aspect-ratios", response_class=MsgspecResponse)
 def list_aspect_ratios():
     """List available output aspect ratios"""
-    return {"aspect_ratios": ASPECT_RATIOS}
+    return MsgspecResponse(AspectRatios(aspect_ratios=ASPECT_RATIOS))
+
+
+def read_job_images(images: list) -> list[bytes]:
+    """Return the raw bytes of each job image.
+
+    Each image is either an UploadFile (multipart requests), read from its
+    spooled temp file, or a base64 data URL (JSON requests), decoded here.
+    Blocking; create_job runs it in a thread.
+    """
+    image_bytes = []
+
+    for i, img in enumerate(images):
+        if isinstance(img, UploadFile):
+            img.file.seek(0)
+            image_bytes.append(img.file.read())
+        else:
+            try:
+                image_bytes.append(decode_base64_image(img))
+            except (ValueError, binascii.Error):
+                raise HTTPException(status_code=400, detail=f"Image {i+1} is not valid base64 data")
+
+    return image_bytes
+
+
+# Checks the queue length and stores + enqueues the job in one atomic step,
+# so concurrent API workers can't push the queue past MAX_QUEUE_LENGTH.
+# KEYS: queue, job key, images key
+# ARGV: max queue length, ttl seconds, job JSON, job id, image 0..n-1
+# Returns -1 when enqueued, otherwise the (full) queue length.
+_ENQUEUE_JOB_SCRIPT = redis_client.register_script("""
+local queued = redis.call('LLEN', KEYS[1])
+if queued >= tonumber(ARGV[1]) then
+    return queued
+end
+local ttl = tonumber(ARGV[2])
+local fields = {}
+for i = 5, #ARGV do
+    fields[#fields + 1] = tostring(i - 5)
+    fields[#fields + 1] = ARGV[i]
+end
+redis.call('HSET', KEYS[3], unpack(fields))
+redis.call('EXPIRE', KEYS[3], ttl)
+redis.call('SET', KEYS[2], ARGV[3], 'EX', ttl)
+redis.call('LPUSH', KEYS[1], ARGV[4])
+return -1
+""")
+
+
+def enqueue_job(job_id: str, job_data: dict, image_bytes: list[bytes]) -> Optional[int]:
+    """Store the images and the job, and enqueue it, if the queue has room
+
+    Images go into the ``job_images:{job_id}`` hash (field = input index);
+    the worker reads and deletes it, so nothing touches the filesystem.
+    Returns None when enqueued, or the queue length when the queue is full.
+    """
+    job_ttl_seconds = IMAGE_EXPIRY_MINUTES * 2 * 60
+    queued = _ENQUEUE_JOB_SCRIPT(
+        keys=["bowerbirder_job_queue", f"job:{job_id}", f"job_images:{job_id}"],
+        args=[
+            MAX_QUEUE_LENGTH,
+            job_ttl_seconds,
+            orjson.dumps(job_data, option=orjson.OPT_UTC_Z),
+            job_id,
+            *image_bytes,
+        ],
+    )
+    return None if queued < 0 else queued
+
 
+@app.post("/jobs", response_class=MsgspecResponse)
+async def create_job(http_request: Request):
+    """Create a new collage generation job
 
-@app.post("/jobs", response_model=JobResponse)
-def create_job(request: JobRequest, http_request: Request):
-    """Create a new collage generation job"""
+    Accepts multipart/form-data (``images`` files plus ``style`` and
+    ``aspect_ratio`` fields) or a JSON JobRequest with base64 data URLs.
+    """
     # Per-IP rate limiting on this anonymous, expensive endpoint so cost
     # cannot be amplified. Uses the trusted real client IP.
     if RATE_LIMIT_ENABLED:
         client_ip = get_client_ip(http_request)
-        rl = check_rate_limit(
+        rl = await asyncio.to_thread(
+            check_rate_limit,
             redis_client,
             client_ip,
             prefix="bowerbirder",
@@ -151,94 +277,108 @@ def create_job(request: JobRequest, http_request: Request):
                 headers={"Retry-After": str(rl.retry_after)},
             )
 
-    # Check queue backpressure
-    queue_length = redis_client.llen("bowerbirder_job_queue")
+    # Fast-fail before reading the body; enqueue_job re-checks atomically
+    queue_length = await asyncio.to_thread(redis_client.llen, "bowerbirder_job_queue")
     if queue_length >= MAX_QUEUE_LENGTH:
         raise HTTPException(
             status_code=503,
             detail=f"Server busy ({queue_length} jobs queued). Try again later."
         )
 
-    if len(request.images) < MIN_IMAGES:
-        raise HTTPException(status_code=400, detail=f"At least {MIN_IMAGES} images required")
+    form = None
+    content_type = http_request.headers.get("content-type", "")
+
+    if content_type.startswith("multipart/form-data"):
+        # Starlette spools each file to a temp file; nothing is base64 encoded
+        form = await http_request.form(max_files=MAX_IMAGES)
+        images = form.getlist("images")
+        if not all(isinstance(img, UploadFile) for img in images):
+            await form.close()
+            raise HTTPException(status_code=400, detail="Images must be uploaded as files")
+        style = form.get("style", "fridge")
+        aspect_ratio = form.get("aspect_ratio", "16:9")
+        image_sizes = [img.size or 0 for img in images]
+    else:
+        body = await http_request.body()
+        try:
+            # Off the event loop: the body can be MAX_TOTAL_SIZE_MB of base64
+            request = await asyncio.to_thread(msgspec.json.decode, body, type=JobRequest)
+        except msgspec.DecodeError as e:
+            # Also covers msgspec.ValidationError (a DecodeError subclass)
+            raise HTTPException(status_code=422, detail=str(e))
+        images = request.images
+        style = request.style
+        aspect_ratio = request.aspect_ratio
+        image_sizes = [len(img) for img in images]
+
+    try:
+        if len(images) < MIN_IMAGES:
+            raise HTTPException(status_code=400, detail=f"At least {MIN_IMAGES} images required")
 
-    if len(request.images) > MAX_IMAGES:
-        raise HTTPException(status_code=400, detail=f"Maximum {MAX_IMAGES} images allowed")
+        if len(images) > MAX_IMAGES:
+            raise HTTPException(status_code=400, detail=f"Maximum {MAX_IMAGES} images allowed")
 
-    MAX_IMAGE_SIZE = MAX_IMAGE_SIZE_MB * 1024 * 1024
-    MAX_TOTAL_SIZE = MAX_TOTAL_SIZE_MB * 1024 * 1024
-    total_size = 0
+        MAX_IMAGE_SIZE = MAX_IMAGE_SIZE_MB * 1024 * 1024
+        MAX_TOTAL_SIZE = MAX_TOTAL_SIZE_MB * 1024 * 1024
+        total_size = 0
 
-    for i, img in enumerate(request.images):
-        img_size = len(img)
-        if img_size > MAX_IMAGE_SIZE:
+        for i, img_size in enumerate(image_sizes):
+            if img_size > MAX_IMAGE_SIZE:
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"Image {i+1} too large ({img_size // 1024 // 1024}MB). Max: {MAX_IMAGE_SIZE_MB}MB"
+                )
+            total_size += img_size
+
+        # Checked before reading anything: this also bounds what each job
+        # hands to the worker through Redis (decoded base64 is smaller still)
+        if total_size > MAX_TOTAL_SIZE:
             raise HTTPException(
                 status_code=413,
-                detail=f"Image {i+1} too large ({img_size // 1024 // 1024}MB). Max: {MAX_IMAGE_SIZE_MB}MB"
+                detail=f"Total request too large ({total_size // 1024 // 1024}MB). Max: {MAX_TOTAL_SIZE_MB}MB"
             )
-        total_size += img_size
 
-    if total_size > MAX_TOTAL_SIZE:
-        raise HTTPException(
-            status_code=413,
-            detail=f"Total request too large ({total_size // 1024 // 1024}MB). Max: {MAX_TOTAL_SIZE_MB}MB"
-        )
+        if style not in ALLOWED_STYLES:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid style. Available: {STYLE_KEYS}"
+            )
 
-    if request.style not in STYLE_PRESETS:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Invalid style. Available: {list(STYLE_PRESETS.keys())}"
-        )
+        if aspect_ratio not in ALLOWED_ASPECT_RATIOS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid aspect ratio. Available: {ASPECT_RATIOS}"
+            )
 
-    if request.aspect_ratio not in ASPECT_RATIOS:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Invalid aspect ratio. Available: {ASPECT_RATIOS}"
-        )
+        # Read/decode the images off the event loop so other requests keep
+        # being served while up to MAX_TOTAL_SIZE_MB is processed
+        image_bytes = await asyncio.to_thread(read_job_images, images)
+    finally:
+        if form is not None:
+            await form.close()
 
     job_id = str(uuid.uuid4())
-
-    # Save images to disk instead of storing in Redis
-    image_dir = os.path.join(JOB_IMAGES_DIR, job_id)
-    os.makedirs(image_dir, exist_ok=True)
-    image_paths = []
-
-    try:
-        for i, img in enumerate(request.images):
-            path = os.path.join(image_dir, f"img_{i:03d}.dat")
-            with open(path, "w") as f:
-                f.write(img)
-            image_paths.append(path)
-    except Exception as e:
-        shutil.rmtree(image_dir, ignore_errors=True)
-        raise HTTPException(status_code=500, detail=f"Failed to save images: {e}")
-
     job_data = {
         "job_id": job_id,
         "status": "queued",
-        "image_paths": image_paths,
-        "image_dir": image_dir,
-        "style": request.style,
-        "aspect_ratio": request.aspect_ratio,
-        "created_at": datetime.now(timezone.utc).isoformat(),
+        "style": style,
+        "aspect_ratio": aspect_ratio,
+        "image_count": len(image_bytes),
+        "created_at": datetime.now(timezone.utc),
     }
 
-    job_ttl_seconds = IMAGE_EXPIRY_MINUTES * 2 * 60
-    redis_client.setex(f"job:{job_id}", job_ttl_seconds, json.dumps(job_data))
-    redis_client.lpush("bowerbirder_job_queue", job_id)
-
-    return JobResponse(job_id=job_id, status="queued")
-
+    queue_length = await asyncio.to_thread(enqueue_job, job_id, job_data, image_bytes)
+    if queue_length is not None:
+        raise HTTPException(
+            status_code=503,
+            detail=f"Server busy ({queue_length} jobs queued). Try again later."
+        )
 
-@app.get("/jobs/{job_id}", response_model=JobStatus)
-def get_job_status(job_id: str):
-    """Get the status of a job"""
-    job_data = redis_client.get(f"job:{job_id}")
-    if not job_data:
-        raise HTTPException(status_code=404, detail="Job not found")
+    return MsgspecResponse(JobResponse(job_id=job_id, status="queued"))
 
-    job = json.loads(job_data)
 
+def build_job_status(job: dict) -> JobStatus:
+    """Project a stored job onto the public JobStatus shape"""
     response = JobStatus(
         job_id=job["job_id"],
         status=job["status"],
@@ -254,6 +394,84 @@ def get_job_status(job_id: str):
     return response
 
 
+@app.get("/jobs/{job_id}", response_class=MsgspecResponse)
+def get_job_status(job_id: str):
+    """Get the status of a job"""
+    job_data = redis_client.get(f"job:{job_id}")
+    if not job_data:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    return MsgspecResponse(build_job_status(orjson.loads(job_data)))
+
+
+@app.get("/jobs/{job_id}/stream")
+async def stream_job_status(job_id: str):
+    """Stream job status updates as Server-Sent Events.
+
+    The worker publishes every status write to ``job_events:{job_id}``;
+    the process-wide JobEventHub hands each one to this stream, which
+    forwards it as a ``data:`` event in the same shape as
+    GET /jobs/{job_id}. The stream ends once the job completes or fails,
+    or after SSE_MAX_STREAM_SECONDS.
+    """
+    try:
+        # Subscribe before reading the current state so no update is missed
+        queue = await job_events.subscribe(job_id, timeout=SSE_SUBSCRIBE_TIMEOUT_SECONDS)
+    except SubscriberUnavailable:
+        # The frontend's onerror path falls back to polling
+        raise HTTPException(status_code=503, detail="Live updates unavailable, poll instead")
+    try:
+        job_data = await async_redis_client.get(f"job:{job_id}")
+        if not job_data:
+            raise HTTPException(status_code=404, detail="Job not found")
+    except BaseException:
+        job_events.unsubscribe(job_id, queue)
+        raise
+
+    def encode_event(job: dict) -> tuple[bytes, bool]:
+        status = build_job_status(job)
+        event = b"data: " + msgspec.json.encode(status) + b"\n\n"
+        return event, status.status in TERMINAL_STATUSES
+
+    async def events():
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + SSE_MAX_STREAM_SECONDS
+        try:
+            event, done = encode_event(orjson.loads(job_data))
+            yield event
+
+            while not done:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    # Give up; the client falls back to polling
+                    return
+
+                try:
+                    message = await asyncio.wait_for(
+                        queue.get(), timeout=min(SSE_KEEPALIVE_SECONDS, remaining)
+                    )
+                except asyncio.TimeoutError:
+                    yield b": keepalive\n\n"
+                    continue
+
+                if message is RESYNC:
+                    # The subscription reconnected; re-read what was missed
+                    message = await async_redis_client.get(f"job:{job_id}")
+                    if not message:
+                        return
+
+                event, done = encode_event(orjson.loads(message))
+                yield event
+        finally:
+            job_events.unsubscribe(job_id, queue)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 # Ensure output directory exists
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 app.mount("/output", StaticFiles(directory=OUTPUT_DIR), name="output")
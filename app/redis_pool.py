@@ -0,0 +1,68 @@
+"""Redis clients backed by explicit, keepalive-enabled connection pools.
+
+The API and worker hold Redis connections across long idle stretches
+(queue waits, quiet nights). TCP keepalive plus a periodic health check
+keep those sockets alive, or detect them dead, before a request needs
+them, instead of paying a reconnect on the hot path. Each process builds
+one pool and shares it across all of its threads.
+"""
+from __future__ import annotations
+
+import socket
+
+import redis
+import redis.asyncio
+
+from app.settings import settings
+
+# Seconds between PING health checks on connections idle that long
+HEALTH_CHECK_INTERVAL = 30
+
+# Seconds a caller waits for a free pooled connection before erroring
+POOL_TIMEOUT = 20
+
+
+def _keepalive_options() -> dict[int, int]:
+    """TCP keepalive tuning; the constants are missing on some platforms."""
+    options = {}
+    for name, value in (("TCP_KEEPIDLE", 30), ("TCP_KEEPINTVL", 10), ("TCP_KEEPCNT", 3)):
+        if hasattr(socket, name):
+            options[getattr(socket, name)] = value
+    return options
+
+
+def create_redis_client(url: str) -> redis.Redis:
+    """Sync client on a sized, keepalive-enabled pool.
+
+    A BlockingConnectionPool makes callers wait (up to POOL_TIMEOUT) when
+    every connection is busy, rather than failing with "Too many
+    connections" the way a plain ConnectionPool does at its cap.
+    """
+    pool = redis.BlockingConnectionPool.from_url(
+        url,
+        max_connections=settings.redis_max_connections,
+        timeout=POOL_TIMEOUT,
+        socket_keepalive=True,
+        socket_keepalive_options=_keepalive_options(),
+        health_check_interval=HEALTH_CHECK_INTERVAL,
+    )
+    return redis.Redis(connection_pool=pool)
+
+
+def create_async_redis_client(url: str) -> redis.asyncio.Redis:
+    """Async client on a sized, keepalive-enabled blocking pool.
+
+    SSE streams share one pub/sub connection per process (see
+    app.job_events), so the pool only has to cover that plus their job
+    reads; the cap keeps a burst of streams off the shared instance's
+    maxclients.
+    """
+    pool = redis.asyncio.BlockingConnectionPool.from_url(
+        url,
+        max_connections=settings.redis_max_connections,
+        timeout=POOL_TIMEOUT,
+        socket_keepalive=True,
+        socket_keepalive_options=_keepalive_options(),
+        health_check_interval=HEALTH_CHECK_INTERVAL,
+    )
+    return redis.asyncio.Redis(connection_pool=pool)
@@ -10,16 +10,23 @@ class Settings(BaseSettings):
 
     # Redis
     redis_url: str = "redis://localhost:6379"
+    # Per-process sync pool size. Callers beyond this wait for a free
+    # connection; keep it >= the threads that can hit Redis at once
+    # (AnyIO's 40-thread pool for sync routes plus to_thread workers).
+    redis_max_connections: int = 64
 
     # Output
     output_dir: str = "/app/output"
-    job_images_dir: str = "/app/job_images"
     image_expiry_minutes: int = 30
     api_base_url: str = "http://api:8000"
 
     # fal.ai
     fal_key: str = ""
 
+    # Worker: max jobs popped per BLMPOP and processed concurrently.
+    # Keep within the fal.ai concurrency limit for the account.
+    worker_concurrency: int = 4
+
     # Security
     api_allowed_ips: str = ""  # Comma-separated
 
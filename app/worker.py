@@ -2,25 +2,31 @@
 from app.settings import settings
 import os
 import io
-import json
+import asyncio
+import functools
 import signal
 import time
-import base64
-import shutil
 import threading
 import logging
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
 import redis
+import orjson
 import fal_client
+import httpx
+from importlib.metadata import version as package_version
 from PIL import Image, ImageOps
 
 # Allow large images
 Image.MAX_IMAGE_PIXELS = 178956970
 
-from app.config import STYLE_PRESETS, OPTIMIZE_MAX_SIZE, OPTIMIZE_QUALITY
+from app.config import (
+    STYLE_PRESETS, OPTIMIZE_MAX_SIZE, OPTIMIZE_QUALITY,
+    INLINE_IMAGE_MAX_KB, INLINE_TOTAL_MAX_KB
+)
+from app.redis_pool import create_redis_client
 
 logging.basicConfig(
     level=logging.INFO,
@@ -40,23 +46,141 @@ def _signal_handler(signum, frame):
     _shutdown_event.set()
 
 
-redis_client = redis.from_url(settings.redis_url)
+# Shared by the job threads and the cleanup thread
+redis_client = create_redis_client(settings.redis_url)
 
 OUTPUT_DIR = settings.output_dir
 IMAGE_EXPIRY_MINUTES = settings.image_expiry_minutes
 API_BASE_URL = settings.api_base_url
+WORKER_CONCURRENCY = max(1, settings.worker_concurrency)
+
+# Sorted set of job_id -> output expiry (epoch seconds), drives cleanup
+OUTPUT_EXPIRY_KEY = "bowerbirder_output_expiry"
+
+# Shared by every job: bounds concurrent full-size PIL decodes (each can be
+# up to Image.MAX_IMAGE_PIXELS) to one per core across the whole worker
+_optimize_executor = ThreadPoolExecutor(
+    max_workers=os.cpu_count() or 1, thread_name_prefix="optimize"
+)
+
+# Read size when streaming the result image to disk
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+
+# Merge fields into the stored job JSON and publish the new state to the
+# job's event channel in a single atomic round-trip (replaces the
+# GET -> mutate -> SET pattern). KEEPTTL preserves the expiry create_job
+# set, so failed or abandoned jobs still age out of Redis.
+_MERGE_JOB_SCRIPT = redis_client.register_script("""
+local raw = redis.call('GET', KEYS[1])
+if not raw then
+    return 0
+end
+local job = cjson.decode(raw)
+for k, v in pairs(cjson.decode(ARGV[1])) do
+    job[k] = v
+end
+local encoded = cjson.encode(job)
+redis.call('SET', KEYS[1], encoded, 'KEEPTTL')
+redis.call('PUBLISH', ARGV[2], encoded)
+return 1
+""")
+
+# Minimum interval between throttled progress writes for the same job
+STATUS_FLUSH_INTERVAL = 0.5
+
+
+class _StatusWriter:
+    """Coalesces job status writes.
+
+    Status transitions and step changes are written immediately. Progress
+    updates passed with ``throttle=True`` are buffered and only flushed if
+    STATUS_FLUSH_INTERVAL has elapsed since the job's last write; anything
+    still buffered rides along with the next write.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending: dict[str, dict] = {}
+        self._last_flush: dict[str, float] = {}
+        self._last_status: dict[str, str] = {}
+
+    def update(self, job_id: str, status: str, throttle: bool = False, **extra):
+        with self._lock:
+            pending = self._pending.setdefault(job_id, {})
+            pending["status"] = status
+            pending.update(extra)
+
+            now = time.monotonic()
+            if (throttle
+                    and self._last_status.get(job_id) == status
+                    and now - self._last_flush.get(job_id, 0.0) < STATUS_FLUSH_INTERVAL):
+                return
+
+            fields = self._pending.pop(job_id)
+            self._last_flush[job_id] = now
+            self._last_status[job_id] = status
+
+        _MERGE_JOB_SCRIPT(
+            keys=[f"job:{job_id}"],
+            args=[orjson.dumps(fields, option=orjson.OPT_UTC_Z), f"job_events:{job_id}"],
+        )
 
+    def forget(self, job_id: str):
+        """Drop per-job bookkeeping once a job is finished."""
+        with self._lock:
+            self._pending.pop(job_id, None)
+            self._last_flush.pop(job_id, None)
+            self._last_status.pop(job_id, None)
 
-def update_job_status(job_id: str, status: str, **extra):
+
+_status_writer = _StatusWriter()
+
+
+def update_job_status(job_id: str, status: str, throttle: bool = False, **extra):
     """Update job status in Redis"""
-    job_data = redis_client.get(f"job:{job_id}")
-    if not job_data:
-        return
+    _status_writer.update(job_id, status, throttle=throttle, **extra)
+
+
+# EXIF orientation tag
+EXIF_ORIENTATION = 0x0112
 
-    job = json.loads(job_data)
-    job["status"] = status
-    job.update(extra)
-    redis_client.set(f"job:{job_id}", json.dumps(job))
+# JPEG segments that only carry metadata: APP1-APP15 (EXIF, XMP, ICC,
+# IPTC, ...) and COM. APP0 (JFIF) is kept, and so is APP14 (Adobe): its
+# transform flag says whether the scan is RGB or YCbCr, and dropping it
+# makes decoders misread RGB-coded JPEGs as YCbCr.
+_JPEG_APP14_ADOBE = 0xEE
+_JPEG_METADATA_MARKERS = (frozenset(range(0xE1, 0xF0)) - {_JPEG_APP14_ADOBE}) | {0xFE}
+
+
+def strip_jpeg_metadata(data: bytes) -> bytes | None:
+    """Drop metadata segments from a JPEG without re-encoding it.
+
+    Returns None if the marker structure isn't what we expect, so the
+    caller can fall back to a full re-encode.
+    """
+    if data[:2] != b"\xff\xd8":
+        return None
+
+    parts = [data[:2]]
+    pos = 2
+    while pos + 4 <= len(data):
+        if data[pos] != 0xFF:
+            return None
+        marker = data[pos + 1]
+        if marker == 0xDA:
+            # Start of scan: everything after is entropy-coded image data
+            parts.append(data[pos:])
+            return b"".join(parts)
+
+        length = int.from_bytes(data[pos + 2:pos + 4], "big")
+        if length < 2:
+            return None
+        if marker not in _JPEG_METADATA_MARKERS:
+            parts.append(data[pos:pos + 2 + length])
+        pos += 2 + length
+
+    return None
 
 
 def optimize_image(image_data: bytes) -> bytes:
@@ -66,9 +190,24 @@ def optimize_image(image_data: bytes) -> bytes:
     - Resize longest edge to 768px
     - Convert to JPEG at 85% quality
     - Strip metadata
+
+    JPEGs that are already RGB, upright and within OPTIMIZE_MAX_SIZE skip
+    the decode/re-encode and only have their metadata stripped.
     """
     img = Image.open(io.BytesIO(image_data))
 
+    # Fast path: Image.open only parses headers, nothing is decoded yet
+    if (img.format == "JPEG" and img.mode == "RGB"
+            and max(img.size) <= OPTIMIZE_MAX_SIZE
+            and img.getexif().get(EXIF_ORIENTATION, 1) == 1):
+        stripped = strip_jpeg_metadata(image_data)
+        if stripped is not None:
+            return stripped
+
+    # Let libjpeg downscale by 1/2, 1/4 or 1/8 while decoding (DCT scaling),
+    # never below OPTIMIZE_MAX_SIZE on either edge. No-op for other formats.
+    img.draft(img.mode, (OPTIMIZE_MAX_SIZE, OPTIMIZE_MAX_SIZE))
+
     # Apply EXIF orientation - fixes rotated phone photos
     img = ImageOps.exif_transpose(img)
 
@@ -89,7 +228,9 @@ def optimize_image(image_data: bytes) -> bytes:
     ratio = max_size / max(img.size)
     if ratio < 1:
         new_size = (int(img.size[0] * ratio), int(img.size[1] * ratio))
-        img = img.resize(new_size, Image.LANCZOS)
+        # reducing_gap does a fast integer box reduce first, then LANCZOS
+        # on the much smaller image
+        img = img.resize(new_size, Image.LANCZOS, reducing_gap=3.0)
 
     # Save as JPEG with quality setting
     buffer = io.BytesIO()
@@ -97,22 +238,86 @@ def optimize_image(image_data: bytes) -> bytes:
     return buffer.getvalue()
 
 
-def decode_base64_image(data_url: str) -> bytes:
-    """Decode base64 data URL to bytes"""
-    # Handle data URL format: data:image/jpeg;base64,/9j/4AAQ...
-    if data_url.startswith('data:'):
-        # Split off the header
-        header, base64_data = data_url.split(',', 1)
-    else:
-        base64_data = data_url
+# Direct CDN uploads reuse fal_client internals that aren't public API
+# (token manager, CDN URL, upload path, "access_url" response key). They
+# were checked against these releases only; any other installed version
+# uploads through the public fal_client.AsyncClient.upload instead.
+_FAL_CDN_VERIFIED_VERSIONS = ("0.5.6",)
+
+try:
+    from fal_client.auth import fetch_credentials
+    from fal_client.client import CDN_URL, CDNTokenManager
+    _FAL_CDN_DIRECT = package_version("fal-client") in _FAL_CDN_VERIFIED_VERSIONS
+except Exception:
+    _FAL_CDN_DIRECT = False
 
-    return base64.b64decode(base64_data)
 
+@functools.cache
+def _fal_cdn_tokens() -> "CDNTokenManager":
+    """fal.ai CDN upload token manager (caches the token until it expires)"""
+    return CDNTokenManager(fetch_credentials())
+
+
+class _FalUploader:
+    """Uploads one job's images to the fal.ai CDN.
+
+    fal_client.upload opens a fresh connection per file, so when the
+    installed fal-client is a verified version, uploads go through one
+    shared HTTP/2 client and multiplex over a single connection. Any
+    failure on that path (or an unverified version) falls back to
+    fal_client's own public upload.
+    """
+
+    def __init__(self):
+        # Per-job client: its async token lock is bound to this job's loop
+        self._fal = fal_client.AsyncClient()
+        self._http: httpx.AsyncClient | None = None
+
+    async def __aenter__(self):
+        if _FAL_CDN_DIRECT:
+            try:
+                token = await asyncio.to_thread(_fal_cdn_tokens().get_token)
+                self._http = httpx.AsyncClient(
+                    http2=True,
+                    headers={"Authorization": f"{token.token_type} {token.token}"},
+                    timeout=httpx.Timeout(10.0, read=120.0, write=120.0),
+                )
+            except Exception as e:
+                logger.warning(f"fal.ai CDN token fetch failed, using fal_client uploads: {e}")
+        return self
+
+    async def __aexit__(self, *exc_info):
+        if self._http is not None:
+            await self._http.aclose()
+
+    async def upload(self, image_bytes: bytes) -> str:
+        """Upload image bytes to fal.ai and return the URL"""
+        if self._http is not None:
+            try:
+                response = await self._http.post(
+                    f"{CDN_URL}/files/upload",
+                    content=image_bytes,
+                    headers={"Content-Type": "image/jpeg"},
+                )
+                response.raise_for_status()
+                return response.json()["access_url"]
+            except (httpx.HTTPError, KeyError, ValueError) as e:
+                logger.warning(f"Direct fal.ai CDN upload failed, retrying via fal_client: {e}")
+
+        return await self._fal.upload(image_bytes, "image/jpeg")
 
-def upload_to_fal(image_bytes: bytes) -> str:
-    """Upload image bytes to fal.ai and return the URL"""
-    url = fal_client.upload(image_bytes, content_type="image/jpeg")
-    return url
+
+def fetch_job_images(job_id: str) -> list[bytes]:
+    """Take a job's input images out of Redis, in upload order.
+
+    Reads and deletes the ``job_images:{job_id}`` hash in one transaction,
+    so the (large) payload is freed as soon as the worker has it.
+    """
+    pipe = redis_client.pipeline()
+    pipe.hgetall(f"job_images:{job_id}")
+    pipe.delete(f"job_images:{job_id}")
+    images, _ = pipe.execute()
+    return [images[idx] for idx in sorted(images, key=int)]
 
 
 def process_job(job_id: str):
@@ -124,45 +329,64 @@ def process_job(job_id: str):
         logger.warning(f"[{job_id}] Job not found in Redis")
         return
 
-    job = json.loads(job_data)
-    update_job_status(job_id, "processing", status_detail="Optimizing images...")
-    image_dir = job.get("image_dir")
+    job = orjson.loads(job_data)
+    update_job_status(job_id, "processing", status_detail="Preparing images...")
 
     try:
-        # Load and optimize images
-        image_paths = job.get("image_paths", [])
-        optimized_images = []
-
-        for i, path in enumerate(image_paths):
-            update_job_status(job_id, "processing",
-                              status_detail=f"Optimizing image {i+1}/{len(image_paths)}...")
-
-            with open(path, "r") as f:
-                data_url = f.read()
-
-            raw_bytes = decode_base64_image(data_url)
+        # Optimize + upload each image concurrently: optimizing runs on the
+        # shared _optimize_executor (PIL releases the GIL while decoding/
+        # encoding) and the uploads share one HTTP/2 connection to fal.ai.
+        image_bytes = fetch_job_images(job_id)
+        if not image_bytes or len(image_bytes) != job.get("image_count", len(image_bytes)):
+            # The hash expired or was evicted under Redis memory pressure
+            logger.warning(f"[{job_id}] Input images missing from Redis "
+                           f"({len(image_bytes)}/{job.get('image_count', '?')})")
+            raise Exception("Uploaded images are no longer available; please resubmit")
+        total = len(image_bytes)
+
+        def optimize(idx: int, raw_bytes: bytes) -> bytes:
             optimized_bytes = optimize_image(raw_bytes)
-            optimized_images.append(optimized_bytes)
-
-            logger.info(f"[{job_id}] Optimized image {i+1}: "
+            logger.info(f"[{job_id}] Optimized image {idx+1}: "
                         f"{len(raw_bytes) // 1024}KB -> {len(optimized_bytes) // 1024}KB")
-
-        # Upload to fal.ai (parallel for speed)
-        update_job_status(job_id, "processing", status_detail="Uploading images...")
-
-        def upload_with_index(args):
-            idx, img_bytes = args
-            url = upload_to_fal(img_bytes)
-            return idx, url
-
-        image_urls = [None] * len(optimized_images)
-        with ThreadPoolExecutor(max_workers=5) as executor:
-            futures = [executor.submit(upload_with_index, (i, img))
-                      for i, img in enumerate(optimized_images)]
-            for future in as_completed(futures):
-                idx, url = future.result()
-                image_urls[idx] = url
-                logger.info(f"[{job_id}] Uploaded image {idx+1}: {url[:60]}...")
+            return optimized_bytes
+
+        async def prepare_all() -> list[str]:
+            image_urls = [None] * total
+            # Budget for images passed inline as data URIs; everything else
+            # is uploaded. Only touched from the event loop, so no lock.
+            inline_budget = INLINE_TOTAL_MAX_KB * 1024
+
+            async with _FalUploader() as uploader:
+                async def prepare(idx: int, raw_bytes: bytes) -> tuple[int, str]:
+                    nonlocal inline_budget
+                    optimized_bytes = await asyncio.get_running_loop().run_in_executor(
+                        _optimize_executor, optimize, idx, raw_bytes
+                    )
+
+                    size = len(optimized_bytes)
+                    if size <= INLINE_IMAGE_MAX_KB * 1024 and size <= inline_budget:
+                        # Small enough to skip the upload round-trip entirely
+                        inline_budget -= size
+                        logger.info(f"[{job_id}] Inlined image {idx+1} ({size // 1024}KB)")
+                        return idx, fal_client.encode(optimized_bytes, "image/jpeg")
+
+                    url = await uploader.upload(optimized_bytes)
+                    logger.info(f"[{job_id}] Uploaded image {idx+1}: {url[:60]}...")
+                    return idx, url
+
+                tasks = [prepare(i, raw) for i, raw in enumerate(image_bytes)]
+                for done, task in enumerate(asyncio.as_completed(tasks), start=1):
+                    idx, url = await task
+                    image_urls[idx] = url
+                    # Redis round-trip: keep it off the event loop
+                    await asyncio.to_thread(
+                        update_job_status, job_id, "processing", throttle=True,
+                        status_detail=f"Prepared image {done}/{total}...",
+                    )
+
+            return image_urls
+
+        image_urls = asyncio.run(prepare_all())
 
         # Get style prompt and insert image count
         style_key = job.get("style", "fridge")
@@ -195,28 +419,36 @@ def process_job(job_id: str):
 
         # Download result image using streaming (handles large files better)
         update_job_status(job_id, "processing", status_detail="Downloading result...")
-        import httpx
         output_path = os.path.join(OUTPUT_DIR, f"{job_id}.png")
-        with httpx.Client(timeout=httpx.Timeout(10.0, read=300.0)) as client:
-            with client.stream("GET", result_url) as response:
-                response.raise_for_status()
-                with open(output_path, "wb") as f:
-                    for chunk in response.iter_bytes(chunk_size=8192):
-                        f.write(chunk)
+        # Write to a temp name and rename, so /output never serves a partial file
+        partial_path = output_path + ".part"
+        try:
+            with httpx.Client(timeout=httpx.Timeout(10.0, read=300.0)) as client:
+                with client.stream("GET", result_url) as response:
+                    response.raise_for_status()
+                    with open(partial_path, "wb") as f:
+                        for chunk in response.iter_bytes(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                            f.write(chunk)
+            os.replace(partial_path, output_path)
+        finally:
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
 
         file_size = os.path.getsize(output_path)
         logger.info(f"[{job_id}] Saved result to {output_path} ({file_size // 1024}KB)")
 
+        # Schedule deletion of the output image
+        redis_client.zadd(OUTPUT_EXPIRY_KEY, {job_id: time.time() + IMAGE_EXPIRY_MINUTES * 60})
+
         # Update job status
         expires_at = datetime.now(timezone.utc) + timedelta(minutes=IMAGE_EXPIRY_MINUTES)
-        expires_at_iso = expires_at.isoformat().replace("+00:00", "Z")
         output_url = f"{API_BASE_URL}/output/{job_id}.png"
 
         update_job_status(
             job_id,
             "completed",
             output_url=output_url,
-            expires_at=expires_at_iso,
+            expires_at=expires_at,
             status_detail=None
         )
 
@@ -228,13 +460,42 @@ def process_job(job_id: str):
         update_job_status(job_id, "failed", error=error_msg, status_detail=None)
 
     finally:
-        # Clean up image directory
-        if image_dir:
-            shutil.rmtree(image_dir, ignore_errors=True)
+        _status_writer.forget(job_id)
 
 
 def cleanup_expired_images():
-    """Delete images older than IMAGE_EXPIRY_MINUTES and their Redis keys"""
+    """Delete images older than IMAGE_EXPIRY_MINUTES and their Redis keys
+
+    Only touches the jobs whose score in the OUTPUT_EXPIRY_KEY sorted set
+    is due, so each tick costs O(expired) rather than a scan of OUTPUT_DIR.
+    """
+    try:
+        due = redis_client.zrangebyscore(OUTPUT_EXPIRY_KEY, 0, time.time())
+        if not due:
+            return
+
+        pipe = redis_client.pipeline(transaction=False)
+        for raw_job_id in due:
+            job_id = raw_job_id.decode() if isinstance(raw_job_id, bytes) else raw_job_id
+            image_file = Path(OUTPUT_DIR) / f"{job_id}.png"
+            image_file.unlink(missing_ok=True)
+            pipe.delete(f"job:{job_id}")
+            pipe.zrem(OUTPUT_EXPIRY_KEY, raw_job_id)
+            logger.info(f"Cleaned up expired image: {image_file.name}")
+        pipe.execute()
+
+        logger.info(f"Cleanup complete: deleted {len(due)} expired image(s)")
+
+    except Exception as e:
+        logger.error(f"Cleanup error: {e}")
+
+
+def sweep_untracked_images():
+    """Delete expired images in OUTPUT_DIR that aren't in OUTPUT_EXPIRY_KEY.
+
+    Full directory scan, run once at startup to catch files written before
+    expiry tracking existed or whose zadd was lost.
+    """
     try:
         now = time.time()
         expiry_seconds = IMAGE_EXPIRY_MINUTES * 60
@@ -254,10 +515,10 @@ def cleanup_expired_images():
                 logger.info(f"Cleaned up expired image: {image_file.name} (age: {int(file_age/60)}m)")
 
         if deleted_count > 0:
-            logger.info(f"Cleanup complete: deleted {deleted_count} expired image(s)")
+            logger.info(f"Startup sweep complete: deleted {deleted_count} expired image(s)")
 
     except Exception as e:
-        logger.error(f"Cleanup error: {e}")
+        logger.error(f"Startup sweep error: {e}")
 
 
 def cleanup_worker():
@@ -273,6 +534,7 @@ def main():
     logger.info("Bowerbirder Worker Started")
     logger.info(f"Output dir: {OUTPUT_DIR}")
     logger.info(f"Image expiry: {IMAGE_EXPIRY_MINUTES} minutes")
+    logger.info(f"Concurrency: {WORKER_CONCURRENCY} jobs")
 
     # Register signal handlers for graceful shutdown
     signal.signal(signal.SIGTERM, _signal_handler)
@@ -280,29 +542,70 @@ def main():
 
     os.makedirs(OUTPUT_DIR, exist_ok=True)
 
+    sweep_untracked_images()
+
     cleanup_thread = threading.Thread(target=cleanup_worker, daemon=True)
     cleanup_thread.start()
     logger.info("Cleanup thread started (checks every 60s)")
 
-    while not _shutdown_event.is_set():
+    # One permit per job slot; a finished job frees its slot immediately
+    slots = threading.Semaphore(WORKER_CONCURRENCY)
+
+    def run_job(job_id: str):
         try:
-            result = redis_client.brpop("bowerbirder_job_queue", timeout=5)
-
-            if result and not _shutdown_event.is_set():
-                _, job_id = result
-                job_id = job_id.decode() if isinstance(job_id, bytes) else job_id
-                logger.info(f"[{job_id}] Starting job")
-                process_job(job_id)
-                logger.info(f"[{job_id}] Job completed")
-
-        except redis.ConnectionError as e:
-            logger.error(f"Redis connection error: {e}")
-            if not _shutdown_event.is_set():
-                time.sleep(5)
-        except Exception as e:
-            logger.error(f"Worker error: {e}")
-            if not _shutdown_event.is_set():
-                time.sleep(1)
+            logger.info(f"[{job_id}] Starting job")
+            process_job(job_id)
+            logger.info(f"[{job_id}] Job completed")
+        except Exception:
+            logger.exception(f"[{job_id}] Job crashed")
+        finally:
+            slots.release()
+
+    with ThreadPoolExecutor(max_workers=WORKER_CONCURRENCY) as executor:
+        while not _shutdown_event.is_set():
+            # Wait for a free slot, then claim every other free one
+            if not slots.acquire(timeout=1):
+                continue
+            free_slots = 1
+            while free_slots < WORKER_CONCURRENCY and slots.acquire(blocking=False):
+                free_slots += 1
+
+            submitted = 0
+            try:
+                # Pull up to free_slots jobs in one round-trip
+                result = redis_client.blmpop(
+                    5, 1, "bowerbirder_job_queue",
+                    direction="RIGHT", count=free_slots,
+                )
+                job_ids = []
+                if result:
+                    _, raw_job_ids = result
+                    job_ids = [job_id.decode() if isinstance(job_id, bytes) else job_id
+                               for job_id in raw_job_ids]
+
+                if job_ids and _shutdown_event.is_set():
+                    # Popped while shutting down: put them back at the
+                    # consuming end, oldest last so it is popped first
+                    redis_client.rpush("bowerbirder_job_queue", *reversed(job_ids))
+                    logger.info(f"Requeued {len(job_ids)} job(s) for shutdown")
+                    job_ids = []
+
+                for job_id in job_ids:
+                    executor.submit(run_job, job_id)
+                    submitted += 1
+
+            except redis.ConnectionError as e:
+                logger.error(f"Redis connection error: {e}")
+                if not _shutdown_event.is_set():
+                    time.sleep(5)
+            except Exception as e:
+                logger.error(f"Worker error: {e}")
+                if not _shutdown_event.is_set():
+                    time.sleep(1)
+            finally:
+                # Hand back the slots that didn't get a job
+                for _ in range(free_slots - submitted):
+                    slots.release()
 
     logger.info("Worker shutdown complete")
 